@@ -1,103 +1,410 @@
 #!/usr/bin/env python3
 #ProjectGuardian2.0
+import codecs
 import csv
 import json
+import mmap
+import os
+import platform
 import re
 import sys
-from typing import Dict, List, Set, Tuple, Any
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple, Any
+
+try:
+    import hyperscan
+except ImportError:  # Optional: fall back to one re pass per pattern
+    hyperscan = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # Optional: fall back to the stdlib csv module
+    pa = pacsv = None
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:  # Optional: fall back to trying each encoding in turn
+    from_bytes = None
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib json module
+    orjson = None
+
+DIGITS = frozenset('0123456789')
+
+# Every character re's \s matches on str patterns (Unicode whitespace tops out at U+3000)
+WHITESPACE = ''.join(ch for ch in map(chr, range(0x3001)) if ch.isspace())
+
+# str.translate tables standing in for re.sub(r'[-\s()]', '', ...) and re.sub(r'\s', '', ...)
+PHONE_STRIP = str.maketrans('', '', '-()' + WHITESPACE)
+WHITESPACE_STRIP = str.maketrans('', '', WHITESPACE)
+
+# orjson turns integers outside [-2**63, 2**64 - 1] into floats, so records with a
+# 19-digit negative or any 20-digit literal skip it
+LONG_INTEGER = re.compile(r'-\d{19}|\d{20}')
+
+# Middle six digits of a 10-digit phone number, as masked by redact_text
+PHONE_MASK = 'X' * 6
+
+# Encodings process_csv tries, in order, when reading the input
+ENCODINGS = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']
+
+# How much of the input the encoding sniffer looks at
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Output is written in large binary batches rather than the default 8KB
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Characters that make csv.writer quote a field (QUOTE_MINIMAL, default dialect)
+CSV_QUOTE_CHARS = frozenset(',"\r\n')
+
+# Below this many records the worker pool costs more to start than it saves
+PARALLEL_MIN_ROWS = 5_000
+
+# Field names that settle a value's PII type without running its detector
+STANDALONE_KEYS = {'phone': 'phone', 'contact': 'phone', 'aadhar': 'aadhar', 'passport': 'passport', 'upi_id': 'upi'}
+COMBINATORIAL_KEYS = {
+    'email': 'email',
+    'address': 'address', 'city': 'address', 'pin_code': 'address', 'state': 'address',
+    'device_id': 'device_id', 'ip_address': 'ip_address',
+}
+NAME_PART_KEYS = frozenset({'first_name', 'last_name'})
+
+# Combinatorial PII categories; two or more together in a record make it PII
+COMBINATORIAL_BITS = {'name': 1, 'email': 2, 'address': 4, 'device_id': 8, 'ip_address': 16}
+
+# Size of the per-value memo caches; repeated values across rows become dict lookups
+CACHE_SIZE = 200_000
+
+# Regex patterns for standalone PII detection
+PATTERNS = {
+    'phone': re.compile(r'\b\d{10}\b'),  # 10-digit numbers
+    'aadhar': re.compile(r'\b[2-9]\d{3}\s?\d{4}\s?\d{4}\b'),  # 12-digit starting with 2-9
+    'passport': re.compile(r'\b[A-Za-z]\d{7}\b'),  # Letter followed by 7 digits
+    'upi': re.compile(r'\b[a-zA-Z0-9.-]{2,256}@[a-zA-Z]{2,64}\b'),  # UPI format
+    'email': re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'),
+}
+
+# Patterns for detection
+PHONE_VARIATIONS = [
+    re.compile(r'\b\+91[-\s]?[789]\d{9}\b'),  # +91 format
+    re.compile(r'\b91[789]\d{9}\b'),          # 91 prefix
+    re.compile(r'\b[789]\d{9}\b'),            # Direct 10-digit
+]
+
+# Name detection
+NAME_PATTERN = re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b')
+
+# Words that make a capitalized pair a place rather than a person (New York, North Goa)
+NAME_STOPWORDS = frozenset({'new', 'york', 'san', 'los', 'las', 'north', 'south', 'east', 'west'})
+
+# Everything scan_text() looks for, tagged by name so one pass reports every PII type
+SCAN_PATTERNS = list(PATTERNS.items()) + [
+    ('phone_intl', PHONE_VARIATIONS[0]),
+    ('phone_91', PHONE_VARIATIONS[1]),
+    ('phone_direct', PHONE_VARIATIONS[2]),
+]
+
+# Literal every match of a pattern must contain: '@' for UPI/email, a digit for the rest
+PATTERN_ANCHORS = {name: '@' if name in ('upi', 'email') else 'digit' for name, _ in SCAN_PATTERNS}
+
+
+def _build_hyperscan_db():
+    """Compile all scan patterns into a single Hyperscan database"""
+    # Only presence is needed, so no start-of-match tracking (which the UPI
+    # pattern's bounded repeat is too large for). Hyperscan has no \b in UCP
+    # mode, so the database works on ASCII semantics
+    flags = [0] * len(SCAN_PATTERNS)
+
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern.pattern.encode('utf-8') for _, pattern in SCAN_PATTERNS],
+            ids=list(range(len(SCAN_PATTERNS))),
+            elements=len(SCAN_PATTERNS),
+            flags=flags,
+        )
+    except hyperscan.error as e:
+        print(f"Hyperscan unavailable ({e}), using re patterns")
+        return None
+    return db
+
+
+# Under PyPy the JIT-compiled re loop beats crossing into the Hyperscan bindings for short strings
+HS_DB = _build_hyperscan_db() if hyperscan and platform.python_implementation() == 'CPython' else None
+HS_EXCLUDED_CHARS = frozenset('\x1c\x1d\x1e\x1f')
+NO_HITS = frozenset()
+
+# Joins a record's values for scan_record(); NUL is not a word character, not
+# whitespace and in no pattern's character classes, so no match can span it
+FIELD_SEPARATOR = '\x00'
+
+
+def find_anchors(text: str) -> Set[str]:
+    """Cheap prefilter: which pattern anchors ('@', 'digit') appear in text"""
+    # \d also matches non-ASCII digits, so only ASCII text can be ruled out
+    if not text.isascii():
+        return {'@', 'digit'}
+
+    anchors = set()
+    if '@' in text:
+        anchors.add('@')
+    if not DIGITS.isdisjoint(text):
+        anchors.add('digit')
+    return anchors
+
+
+def _scan_re(text: str, anchors: Set[str]) -> FrozenSet[str]:
+    """scan_text() backend: one re search per pattern whose anchor is present"""
+    return frozenset(name for name, pattern in SCAN_PATTERNS
+                     if PATTERN_ANCHORS[name] in anchors and pattern.search(text))
+
+
+def _scan_hyperscan(text: str, anchors: Set[str]) -> FrozenSet[str]:
+    """scan_text() backend: a single pass over the combined Hyperscan database"""
+    # Hyperscan agrees with re only on ASCII text outside \x1c-\x1f (whitespace to re's \s, not to it)
+    if not text.isascii() or not HS_EXCLUDED_CHARS.isdisjoint(text):
+        return _scan_re(text, anchors)
+
+    hits = set()
+
+    def on_match(pattern_id, start, end, flags, context):
+        hits.add(SCAN_PATTERNS[pattern_id][0])
+
+    HS_DB.scan(text.encode('ascii'), match_event_handler=on_match)
+    return frozenset(hits)
+
+
+_scan = _scan_hyperscan if HS_DB is not None else _scan_re
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def scan_text(text: str) -> FrozenSet[str]:
+    """Find which PII patterns occur in text, by pattern name"""
+    if not text:
+        return NO_HITS
+
+    # Most fields have no '@' and no digits, so no pattern can match
+    anchors = find_anchors(text)
+    if not anchors:
+        return NO_HITS
+    return _scan(text, anchors)
+
+
+def scan_record(texts: List[str]) -> List[FrozenSet[str]]:
+    """scan_text() for every field value of a record, in order.
+
+    With Hyperscan the eligible values are joined with a separator no pattern can
+    match across and scanned in one call, matches being mapped back to their field
+    by offset. The re backend scans (and memoizes) each value on its own.
+    """
+    if HS_DB is None:
+        return [scan_text(text) for text in texts]
+
+    results = [NO_HITS] * len(texts)
+    batch = []
+    batch_indexes = []
+    for index, text in enumerate(texts):
+        if not text or not find_anchors(text):
+            continue
+        if text.isascii() and HS_EXCLUDED_CHARS.isdisjoint(text):
+            batch.append(text)
+            batch_indexes.append(index)
+        else:
+            results[index] = scan_text(text)
+
+    if not batch:
+        return results
+
+    # Start offset of each value within the joined buffer
+    starts = []
+    offset = 0
+    for text in batch:
+        starts.append(offset)
+        offset += len(text) + 1
+
+    hits = [set() for _ in batch]
+
+    def on_match(pattern_id, start, end, flags, context):
+        # Matches never span a separator, so the last matched character locates the field
+        hits[bisect_right(starts, end - 1) - 1].add(SCAN_PATTERNS[pattern_id][0])
+
+    HS_DB.scan(FIELD_SEPARATOR.join(batch).encode('ascii'), match_event_handler=on_match)
+    for index, field_hits in zip(batch_indexes, hits):
+        results[index] = frozenset(field_hits)
+    return results
+
+
+def _has_phone(str_text: str, hits: FrozenSet[str]) -> bool:
+    """Phone check on top of scan_text() hits for str_text"""
+    if str_text.isdecimal():
+        # Bare digits need no regex: a 10-digit number, or 91 followed by a mobile number
+        return len(str_text) == 10 or (len(str_text) == 12 and str_text[:2] == '91' and str_text[2] in '789')
+
+    if 'phone_intl' in hits or 'phone_91' in hits or 'phone_direct' in hits:
+        return True
+
+    # Remove spaces and common separators; only rescan if that changed anything
+    cleaned = str_text.translate(PHONE_STRIP)
+    if cleaned == str_text:
+        return 'phone' in hits
+    return bool(PATTERNS['phone'].search(cleaned))
+
+
+def _has_aadhar(str_text: str, hits: FrozenSet[str]) -> bool:
+    """Aadhar check on top of scan_text() hits for str_text"""
+    if str_text.isdecimal():
+        return _is_aadhar_digits(str_text)
+
+    # Check with and without spaces - but must start with 2-9
+    if 'aadhar' in hits:
+        return True
+
+    # Remove spaces and check 12-digit format starting with 2-9
+    cleaned = str_text.translate(WHITESPACE_STRIP)
+    return _is_aadhar_digits(cleaned)
+
+
+def _is_aadhar_digits(digits: str) -> bool:
+    """Check for exactly 12 digits starting with 2-9 without going through re"""
+    # str.isdecimal() accepts the same characters as re's \d on str patterns
+    return len(digits) == 12 and digits[0] in '23456789' and digits.isdecimal()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _extract_names(str_text: str) -> Tuple[str, ...]:
+    names = []
+    # Look for capitalized first + last name combinations
+    matches = NAME_PATTERN.findall(str_text)
+    for match in matches:
+        # Skip common false positives
+        words = match.lower().split()
+        if len(words) >= 2 and NAME_STOPWORDS.isdisjoint(words):
+            names.append(match)
+    return tuple(names)
+
+
+def _mask_phone_matches(pattern: re.Pattern, text: str) -> str:
+    """Mask every match of pattern in text, keeping its first and last two characters"""
+    parts = []
+    last = 0
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        # Plain 10-digit numbers (the common case) reuse the precomputed mask
+        mask = PHONE_MASK if end - start == 10 else 'X' * (end - start - 4)
+        parts.append(text[last:start + 2])
+        parts.append(mask)
+        parts.append(text[end - 2:end])
+        last = end
+
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+def _redact_upi(match: re.Match) -> str:
+    """Keep the first three characters of a UPI handle and its provider"""
+    user, provider = match.group().split('@', 1)
+    return user[:3] + 'XXX@' + provider
+
+
+def _mask_emails(text: str) -> str:
+    """Mask the local part of every email in text, splicing from a single finditer pass"""
+    parts = []
+    last = 0
+    for match in PATTERNS['email'].finditer(text):
+        start, end = match.span()
+        email = text[start:end]
+        local, domain = email.split('@', 1)
+        parts.append(text[last:start])
+        if len(local) > 3:
+            parts.append(local[:3] + 'XXX@' + domain)
+        else:
+            parts.append('XXX@' + domain)
+        last = end
+
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+def _mask_names(text: str, names: Tuple[str, ...]) -> str:
+    """Replace each detected name in text with its initials (John Doe -> JXXX DXXX)"""
+    for name in names:
+        parts = name.split()
+        masked = parts[0][0] + 'XXX ' + parts[-1][0] + 'XXX' if len(parts) >= 2 else 'XXXX'
+        text = text.replace(name, masked)
+    return text
+
+
+def _csv_field(value: Any) -> str:
+    text = '' if value is None else str(value)
+    if CSV_QUOTE_CHARS.isdisjoint(text):
+        return text
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _csv_line(*fields: Any) -> bytes:
+    """Encode one row exactly as csv.writer would (minimal quoting, \\r\\n endings)"""
+    return (','.join(map(_csv_field, fields)) + '\r\n').encode('utf-8')
 
 
 class PIIDetector:
     def __init__(self):
-        # Regex patterns for standalone PII detection
-        self.patterns = {
-            'phone': re.compile(r'\b\d{10}\b'),  # 10-digit numbers
-            'aadhar': re.compile(r'\b[2-9]\d{3}\s?\d{4}\s?\d{4}\b'),  # 12-digit starting with 2-9
-            'passport': re.compile(r'\b[A-Z]\d{7}\b', re.IGNORECASE),  # Letter followed by 7 digits
-            'upi': re.compile(r'\b[a-zA-Z0-9.-]{2,256}@[a-zA-Z]{2,64}\b'),  # UPI format
-            'email': re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'),
-        }
-
-        # Patterns for detection
-        self.phone_variations = [
-            re.compile(r'\b\+91[-\s]?[789]\d{9}\b'),  # +91 format
-            re.compile(r'\b91[789]\d{9}\b'),          # 91 prefix
-            re.compile(r'\b[789]\d{9}\b'),            # Direct 10-digit
-        ]
-
-        # Name detection 
-        self.name_pattern = re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b')
+        # Compiled once at module level so the memoized helpers can share them
+        self.patterns = PATTERNS
+        self.phone_variations = PHONE_VARIATIONS
+        self.name_pattern = NAME_PATTERN
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """Find which PII patterns occur in text, by pattern name"""
+        return scan_text(text)
 
     def is_phone_number(self, text: str) -> bool:
         """Check if text contains phone number"""
         if not text:
             return False
-
-        # Convert to string and remove spaces and common separators for checking
         str_text = str(text).strip()
-        cleaned = re.sub(r'[-\s()]', '', str_text)
-
-        # Check various phone number patterns
-        if self.patterns['phone'].search(cleaned):
-            return True
-
-        for pattern in self.phone_variations:
-            if pattern.search(str_text):
-                return True
-
-        return False
+        # Bare digits are settled without scanning
+        return _has_phone(str_text, NO_HITS if str_text.isdecimal() else scan_text(str_text))
 
     def is_aadhar_number(self, text: str) -> bool:
         """Check if text contains Aadhar number"""
         if not text:
             return False
-
         str_text = str(text).strip()
-
-        # Check with and without spaces - but must start with 2-9
-        if self.patterns['aadhar'].search(str_text):
-            return True
-
-        # Remove spaces and check 12-digit format starting with 2-9
-        cleaned = re.sub(r'\s', '', str_text)
-        if re.match(r'^[2-9]\d{11}$', cleaned):
-            return True
-
-        return False
+        return _has_aadhar(str_text, NO_HITS if str_text.isdecimal() else scan_text(str_text))
 
     def is_passport_number(self, text: str) -> bool:
         """Check if text contains passport number"""
         if not text:
             return False
-        return bool(self.patterns['passport'].search(str(text).strip()))
+        return 'passport' in scan_text(str(text).strip())
 
     def is_upi_id(self, text: str) -> bool:
         """Check if text contains UPI ID"""
         if not text:
             return False
-        return bool(self.patterns['upi'].search(str(text).strip()))
+        return 'upi' in scan_text(str(text).strip())
 
     def is_email(self, text: str) -> bool:
         """Check if text contains email address"""
         if not text:
             return False
-        return bool(self.patterns['email'].search(str(text).strip()))
+        return 'email' in scan_text(str(text).strip())
 
     def extract_names(self, text: str) -> List[str]:
         """Extract potential names from text"""
         if not text:
             return []
-
-        names = []
-        str_text = str(text).strip()
-        # Look for capitalized first + last name combinations
-        matches = self.name_pattern.findall(str_text)
-        for match in matches:
-            # Skip common false positives
-            words = match.split()
-            if len(words) >= 2 and not any(word.lower() in ['new', 'york', 'san', 'los', 'las', 'north', 'south', 'east', 'west'] for word in words):
-                names.append(match)
-        return names
+        return list(_extract_names(str(text).strip()))
 
     def redact_text(self, text: str, entity_type: str) -> str:
         """Redact sensitive information from text"""
@@ -108,8 +415,8 @@ class PIIDetector:
 
         if entity_type == 'phone':
             for pattern in self.phone_variations:
-                redacted = pattern.sub(lambda m: m.group()[:2] + 'X' * (len(m.group()) - 4) + m.group()[-2:], redacted)
-            redacted = self.patterns['phone'].sub(lambda m: m.group()[:2] + 'X' * 6 + m.group()[-2:], redacted)
+                redacted = _mask_phone_matches(pattern, redacted)
+            redacted = _mask_phone_matches(self.patterns['phone'], redacted)
 
         elif entity_type == 'aadhar':
             # Improved Aadhar redaction
@@ -126,24 +433,13 @@ class PIIDetector:
             redacted = self.patterns['passport'].sub('[REDACTED_PASSPORT]', redacted)
 
         elif entity_type == 'upi':
-            redacted = self.patterns['upi'].sub(lambda m: m.group().split('@')[0][:3] + 'XXX@' + m.group().split('@')[1], redacted)
+            redacted = self.patterns['upi'].sub(_redact_upi, redacted)
 
         elif entity_type == 'email':
-            def redact_email(match):
-                email = match.group()
-                parts = email.split('@')
-                if len(parts[0]) > 3:
-                    return parts[0][:3] + 'XXX@' + parts[1]
-                else:
-                    return 'XXX@' + parts[1]
-            redacted = self.patterns['email'].sub(redact_email, redacted)
+            redacted = _mask_emails(redacted)
 
         elif entity_type == 'name':
-            names = self.extract_names(redacted)
-            for name in names:
-                parts = name.split()
-                masked = parts[0][0] + 'XXX ' + parts[-1][0] + 'XXX' if len(parts) >= 2 else 'XXXX'
-                redacted = redacted.replace(name, masked)
+            redacted = _mask_names(redacted, _extract_names(redacted))
 
         return redacted
 
@@ -152,74 +448,203 @@ class PIIDetector:
         has_pii = False
         redacted_data = {}
 
-        # Track combinatorial PII elements
-        combinatorial_elements = {
-            'name': [],
-            'email': [],
-            'address': [],
-            'device_id': [],
-            'ip_address': []
-        }
-
+        # Combinatorial PII categories seen so far, one COMBINATORIAL_BITS bit each, plus the
+        # fields to redact if two or more turn up: (element type, key, stripped value, names)
+        combo_mask = 0
+        combo_fields = []
+
+        # Loop-invariant lookups bound to locals once per record instead of once per field
+        standalone_key_type = STANDALONE_KEYS.get
+        combinatorial_key_type = COMBINATORIAL_KEYS.get
+        has_phone = _has_phone
+        has_aadhar = _has_aadhar
+        redact_text = self.redact_text
+
+        # First pass: empty values pass straight through, the rest are normalized to
+        # stripped strings. Every key is inserted now so the output keeps the input order
+        keys = []
+        str_values = []
         for key, value in data.items():
+            redacted_data[key] = value
             if value is None or value == '':
-                redacted_data[key] = value
                 continue
 
-            str_value = str(value).strip()
-            redacted_value = str_value
-
-            # Check for standalone PII (these are PII on their own)
-            if key in ['phone', 'contact'] or self.is_phone_number(str_value):
-                has_pii = True
-                redacted_value = self.redact_text(str_value, 'phone')
+            value_type = type(value)
+            if value_type is str:
+                str_value = value.strip()
+            elif value_type is int or value_type is float:
+                # Numbers never carry surrounding whitespace
+                str_value = str(value)
+            else:
+                str_value = str(value).strip()
+            keys.append(key)
+            str_values.append(str_value)
 
-            elif key == 'aadhar' or self.is_aadhar_number(str_value):
-                has_pii = True
-                redacted_value = self.redact_text(str_value, 'aadhar')
+        # One scan over the whole record finds every PII pattern present in each field
+        for key, str_value, hits in zip(keys, str_values, scan_record(str_values)):
+            redacted_value = str_value
 
-            elif key == 'passport' or self.is_passport_number(str_value):
-                has_pii = True
-                redacted_value = self.redact_text(str_value, 'passport')
+            # Check for standalone PII (these are PII on their own). A known key settles
+            # its own type, but the types ahead of it in the chain still take precedence
+            keyed_type = standalone_key_type(key)
+            if keyed_type == 'phone' or has_phone(str_value, hits):
+                entity_type = 'phone'
+            elif keyed_type == 'aadhar' or has_aadhar(str_value, hits):
+                entity_type = 'aadhar'
+            elif keyed_type == 'passport' or 'passport' in hits:
+                entity_type = 'passport'
+            elif keyed_type == 'upi' or 'upi' in hits:
+                entity_type = 'upi'
+            else:
+                entity_type = None
 
-            elif key == 'upi_id' or self.is_upi_id(str_value):
+            if entity_type:
                 has_pii = True
-                redacted_value = self.redact_text(str_value, 'upi')
+                redacted_value = redact_text(str_value, entity_type)
 
             # Collect combinatorial PII elements (only PII when combined)
-            if key == 'name' or (key in ['first_name', 'last_name'] and 'name' not in data):
-                if self.extract_names(str_value) or key in ['first_name', 'last_name']:
-                    combinatorial_elements['name'].append(key)
-
-            elif key == 'email' or self.is_email(str_value):
-                combinatorial_elements['email'].append(key)
-
-            elif key in ['address', 'city', 'pin_code', 'state']:
-                combinatorial_elements['address'].append(key)
-
-            elif key in ['device_id', 'ip_address']:
-                combinatorial_elements[key].append(key)
+            keyed_element = combinatorial_key_type(key)
+            if key == 'name' or (key in NAME_PART_KEYS and 'name' not in data):
+                names = _extract_names(str_value)
+                if names or key in NAME_PART_KEYS:
+                    combo_mask |= COMBINATORIAL_BITS['name']
+                    combo_fields.append(('name', key, str_value, names))
+
+            elif keyed_element == 'email' or 'email' in hits:
+                combo_mask |= COMBINATORIAL_BITS['email']
+                combo_fields.append(('email', key, str_value, ()))
+
+            elif keyed_element:
+                combo_mask |= COMBINATORIAL_BITS[keyed_element]
+                # Address parts only count towards the combination; they are not redacted
+                if keyed_element != 'address':
+                    combo_fields.append((keyed_element, key, str_value, ()))
 
             redacted_data[key] = redacted_value
 
-        # Check for combinatorial PII (2 or more elements from different categories)
-        combinatorial_count = sum(1 for elements in combinatorial_elements.values() if elements)
-
-        if combinatorial_count >= 2:
+        # Check for combinatorial PII (2 or more elements from different categories,
+        # i.e. more than one bit set)
+        if combo_mask & (combo_mask - 1):
             has_pii = True
             # Redact combinatorial elements
-            for element_type, fields in combinatorial_elements.items():
-                for field in fields:
-                    if field in redacted_data:
-                        if element_type == 'name':
-                            redacted_data[field] = self.redact_text(str(redacted_data[field]), 'name')
-                        elif element_type == 'email':
-                            redacted_data[field] = self.redact_text(str(redacted_data[field]), 'email')
-                        elif element_type in ['device_id', 'ip_address']:
-                            redacted_data[field] = '[REDACTED_' + element_type.upper() + ']'
+            for element_type, field, str_value, names in combo_fields:
+                if element_type == 'name':
+                    if redacted_data[field] is str_value:
+                        # Untouched by standalone redaction, so the detected names still apply
+                        redacted_data[field] = _mask_names(str_value, names)
+                    else:
+                        redacted_data[field] = redact_text(str(redacted_data[field]), 'name')
+                elif element_type == 'email':
+                    redacted_data[field] = redact_text(str(redacted_data[field]), 'email')
+                else:
+                    redacted_data[field] = '[REDACTED_' + element_type.upper() + ']'
 
         return has_pii, redacted_data
 
+    def analyze_json(self, json_text: str) -> Tuple[Optional[bool], str]:
+        """Analyze one data_json value, returning (is_pii, redacted JSON) or (None, decode error)"""
+        # orjson can't round-trip NaN/Infinity or integers outside 64 bits; those records stay on json
+        use_orjson = orjson is not None and not LONG_INTEGER.search(json_text)
+        if use_orjson:
+            try:
+                json_data = orjson.loads(json_text)
+            except orjson.JSONDecodeError:
+                use_orjson = False  # json.loads reports the error (or accepts NaN/Infinity)
+
+        if not use_orjson:
+            try:
+                # Parse JSON data
+                json_data = json.loads(json_text)
+            except json.JSONDecodeError as je:
+                return None, str(je)
+
+        has_pii, redacted_data = self.analyze_record(json_data)
+        if use_orjson:
+            return has_pii, orjson.dumps(redacted_data).decode('utf-8')
+        # Same compact, unescaped form orjson writes, so every row looks alike
+        redacted_json = json.dumps(redacted_data, separators=(',', ':'), ensure_ascii=False)
+        if not redacted_json.isascii():
+            try:
+                redacted_json.encode('utf-8')
+            except UnicodeEncodeError:  # Lone surrogates from \ud800-style escapes stay escaped
+                redacted_json = json.dumps(redacted_data, separators=(',', ':'))
+        return has_pii, redacted_json
+
+    def analyze_json_values(self, json_values: List[str]) -> Iterator[Tuple[Optional[bool], str]]:
+        """Yield analyze_json() for each value in order, sharded across processes for large inputs"""
+        workers = os.cpu_count() or 1
+        if workers < 2 or len(json_values) < PARALLEL_MIN_ROWS:
+            yield from map(self.analyze_json, json_values)
+            return
+
+        chunksize = max(1, len(json_values) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(type(self),)) as executor:
+            yield from executor.map(_analyze_json, json_values, chunksize=chunksize)
+
+    def _candidate_encodings(self, input_file: str) -> List[str]:
+        """Encodings to try for input_file, guided by its first 64KB"""
+        with open(input_file, 'rb') as f:
+            sample = f.read(ENCODING_SAMPLE_SIZE)
+
+        if sample.startswith(codecs.BOM_UTF8):
+            return ['utf-8-sig'] + [enc for enc in ENCODINGS if enc != 'utf-8-sig']
+
+        try:
+            # Incremental so a multi-byte character cut off at the end of the sample still passes
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        except UnicodeDecodeError:
+            pass
+        else:
+            # latin-1/cp1252 decode any bytes, so valid UTF-8 must never be sniffed as them
+            return list(ENCODINGS)
+
+        if from_bytes is None:
+            return list(ENCODINGS)
+
+        # Not UTF-8: only choose between the single-byte encodings; tiny samples otherwise sniff as exotic code pages
+        best = from_bytes(sample, cp_isolation=['latin_1', 'cp1252']).best()
+        if best is None:
+            return list(ENCODINGS)
+
+        detected = codecs.lookup(best.encoding).name
+        return [detected] + [enc for enc in ENCODINGS if codecs.lookup(enc).name != detected]
+
+    def _read_columns(self, input_file: str, f, encoding: str, delimiter: str) -> Dict[str, List[str]]:
+        """Read the whole CSV column-wise, keyed by header name"""
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, [])
+
+        if not header:
+            return {}
+
+        # Arrow can't key duplicate headers by name; those files take the csv.reader path
+        if pacsv is not None and len(set(header)) == len(header):
+            # Arrow parses straight out of a read-only mapping of the file instead of a
+            # copy; the mapping is released along with the last reference to it
+            with open(input_file, 'rb') as raw:
+                mapped = mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+
+            # Every column as string so values like record_id '007' survive untouched
+            try:
+                table = pacsv.read_csv(
+                    pa.BufferReader(pa.py_buffer(mapped)),
+                    read_options=pacsv.ReadOptions(encoding=encoding, column_names=header, skip_rows=1),
+                    parse_options=pacsv.ParseOptions(delimiter=delimiter, newlines_in_values=True),
+                    convert_options=pacsv.ConvertOptions(column_types={col: pa.string() for col in header}),
+                )
+                return {col: table.column(col).to_pylist() for col in table.column_names}
+            except (pa.ArrowInvalid, KeyError):
+                # Ragged rows and the like: reader is still just past the header, so let
+                # csv.reader take the file with DictReader's semantics rather than fail it
+                pass
+
+        rows = [row for row in reader if row]
+        # Later duplicate headers win and short rows read as None, as with csv.DictReader
+        indexes = {col: i for i, col in enumerate(header)}
+        return {col: [row[i] if i < len(row) else None for row in rows] for col, i in indexes.items()}
+
     def process_csv(self, input_file: str, output_file: str = None):
         """Process CSV file and detect/redact PII"""
         if not output_file:
@@ -227,11 +652,12 @@ class PIIDetector:
             base_name = input_file.replace('.csv', '')
             output_file = 'redacted_output_Barath_S.csv'
 
-        results = []
+        record_count = 0
+        pii_count = 0
 
         try:
-            # Try different encodings to handle various file formats
-            encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']
+            # Try different encodings to handle various file formats, sniffed one first
+            encodings = self._candidate_encodings(input_file)
             file_read = False
 
             for encoding in encodings:
@@ -247,47 +673,55 @@ class PIIDetector:
                         # Check if it looks like CSV
                         if ',' not in first_line and ';' in first_line:
                             # Try semicolon delimiter
-                            reader = csv.DictReader(f, delimiter=';')
+                            delimiter = ';'
                         else:
-                            reader = csv.DictReader(f)
-
-                        # Process rows
-                        row_count = 0
-                        for row in reader:
-                            row_count += 1
-
-                            # Look for data_json column (case insensitive)
-                            json_column = None
-                            for col in row.keys():
-                                if 'json' in col.lower() or col.lower() in ['data_json', 'Data_json']:
-                                    json_column = col
-                                    break
-
-                            if json_column and row[json_column]:
-                                try:
-                                    # Parse JSON data
-                                    json_data = json.loads(row[json_column])
-                                    has_pii, redacted_data = self.analyze_record(json_data)
-
-                                    result = {
-                                        'record_id': row.get('record_id', str(row_count)),
-                                        'redacted_data_json': json.dumps(redacted_data),
-                                        'is_pii': has_pii
-                                    }
-                                    results.append(result)
-
-                                except json.JSONDecodeError as je:
-                                    print(f"JSON decode error in row {row_count}: {je}")
-                                    # Handle invalid JSON
-                                    result = {
-                                        'record_id': row.get('record_id', str(row_count)),
-                                        'redacted_data_json': row.get(json_column, ''),
-                                        'is_pii': False
-                                    }
-                                    results.append(result)
-                            else:
-                                if row_count <= 5:  # Only show first few errors
-                                    print(f"No JSON data found in row {row_count}, columns: {list(row.keys())}")
+                            delimiter = ','
+
+                        columns = self._read_columns(input_file, f, encoding, delimiter)
+
+                        # Look for data_json column (case insensitive)
+                        json_column = None
+                        for col in columns:
+                            if 'json' in col.lower() or col.lower() in ['data_json', 'Data_json']:
+                                json_column = col
+                                break
+
+                        json_values = columns[json_column] if json_column else []
+                        record_ids = columns.get('record_id')
+                        num_rows = len(next(iter(columns.values()), []))
+
+                        # Records are independent, so analysis can run across worker processes
+                        json_texts = [text for text in json_values if text]
+                        outcomes = self.analyze_json_values(json_texts)
+
+                        # Every row with JSON yields an output row, so only create the file if there are any
+                        record_count = 0
+                        pii_count = 0
+                        with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) if json_texts else nullcontext() as out_f:
+                            if out_f:
+                                out_f.write(_csv_line('record_id', 'redacted_data_json', 'is_pii'))
+                            write = out_f.write if out_f else None
+                            next_outcome = outcomes.__next__
+
+                            # Process rows, writing each result as it completes
+                            for row_index in range(num_rows):
+                                row_count = row_index + 1
+                                json_text = json_values[row_index] if json_column else None
+                                record_id = record_ids[row_index] if record_ids is not None else str(row_count)
+
+                                if json_text:
+                                    has_pii, redacted_json = next_outcome()
+                                    if has_pii is None:
+                                        print(f"JSON decode error in row {row_count}: {redacted_json}")
+                                        # Handle invalid JSON
+                                        has_pii, redacted_json = False, json_text
+
+                                    write(_csv_line(record_id, redacted_json, has_pii))
+                                    record_count += 1
+                                    pii_count += has_pii
+                                else:
+                                    if row_count <= 5:  # Only show first few errors
+                                        print(f"No JSON data found in row {row_count}, columns: {list(columns)}")
 
                         file_read = True
                         break
@@ -302,17 +736,11 @@ class PIIDetector:
             if not file_read:
                 raise Exception("Could not read file with any supported encoding")
 
-            # Write results
-            if results:
-                with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=['record_id', 'redacted_data_json', 'is_pii'])
-                    writer.writeheader()
-                    writer.writerows(results)
-
-                print(f"\nProcessed {len(results)} records. Output saved to {output_file}")
-                pii_count = sum(1 for r in results if r['is_pii'])
-                if len(results) > 0:
-                    print(f"PII detected in {pii_count} records ({pii_count/len(results)*100:.1f}%)")
+            # Report results
+            if record_count:
+                print(f"\nProcessed {record_count} records. Output saved to {output_file}")
+                if record_count > 0:
+                    print(f"PII detected in {pii_count} records ({pii_count/record_count*100:.1f}%)")
                 else:
                     print("No valid records found")
             else:
@@ -330,6 +758,19 @@ class PIIDetector:
             sys.exit(1)
 
 
+# Per-process detector for the worker pool, built once by _init_worker
+_worker_detector = None
+
+
+def _init_worker(detector_class=PIIDetector):
+    global _worker_detector
+    _worker_detector = detector_class()
+
+
+def _analyze_json(json_text: str) -> Tuple[Optional[bool], str]:
+    return _worker_detector.analyze_json(json_text)
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python detector_Barath_S.py <input_csv_file>")
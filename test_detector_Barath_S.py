@@ -0,0 +1,59 @@
+import csv
+import os
+import tempfile
+import unittest
+from typing import List
+
+import detector_Barath_S
+from detector_Barath_S import ENCODING_SAMPLE_SIZE, ENCODINGS, PIIDetector
+
+
+class CandidateEncodingsTest(unittest.TestCase):
+    def setUp(self):
+        self.detector = PIIDetector()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, data: bytes) -> str:
+        path = os.path.join(self.tmpdir.name, 'input.csv')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def _redacted_values(self, path: str) -> List[str]:
+        output = os.path.join(self.tmpdir.name, 'output.csv')
+        self.detector.process_csv(path, output)
+        with open(output, encoding='utf-8', newline='') as f:
+            return [row['redacted_data_json'] for row in csv.DictReader(f)]
+
+    def test_small_utf8_file_keeps_utf8_first(self):
+        path = self._write('record_id,data_json\n1,"{""city"": ""café €5""}"\n'.encode('utf-8'))
+
+        self.assertEqual(self.detector._candidate_encodings(path), ENCODINGS)
+        self.assertEqual(self._redacted_values(path), ['{"city":"café €5"}'])
+
+    def test_utf8_character_split_by_sample_keeps_utf8_first(self):
+        header = b'record_id,data_json\n'
+        prefix = header + b'1,"{""note"": ""'
+        # The 3-byte euro sign starts one byte before the end of the sample
+        prefix += b'x' * (ENCODING_SAMPLE_SIZE - 1 - len(prefix))
+        path = self._write(prefix + '€ Müller""}"\n'.encode('utf-8'))
+
+        self.assertEqual(self.detector._candidate_encodings(path), ENCODINGS)
+        self.assertTrue(self._redacted_values(path)[0].endswith('€ Müller"}'))
+
+    def test_bom_puts_utf8_sig_first(self):
+        path = self._write(b'\xef\xbb\xbfrecord_id,data_json\n1,"{}"\n')
+
+        self.assertEqual(self.detector._candidate_encodings(path)[0], 'utf-8-sig')
+
+    def test_non_utf8_file_skips_utf8_first(self):
+        path = self._write('record_id,data_json\n1,"{""city"": ""Zürich""}"\n'.encode('latin-1'))
+
+        if detector_Barath_S.from_bytes is not None:
+            self.assertNotEqual(self.detector._candidate_encodings(path)[0], 'utf-8')
+        self.assertEqual(self._redacted_values(path), ['{"city":"Zürich"}'])
+
+
+if __name__ == '__main__':
+    unittest.main()